@@ -4,6 +4,9 @@ from functools import partial
 import logging
 from pathlib import Path
 import os
+import pickle
+import threading
+import time
 
 
 from bokeh import events
@@ -20,49 +23,172 @@ from matplotlib.cm import ScalarMappable, get_cmap
 import numpy as np
 from tornado import gen
 
+try:
+    from fast_histogram import histogram1d
+except ImportError:
+    histogram1d = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
 
 MIN_VAL = 0
 MAX_VAL = 3
 GREY_THRESHOLD = 0.01
 ALPHA = 0.7
+# the histogram is display-only, so subsets bigger than this are
+# strided down to roughly this many values
+HIST_PIXEL_BUDGET = 1000000
 DATA_DIRECTORY = os.getenv('MRMS_DATADIR', '~/.mrms')
+TIMES_CACHE = Path('~/.cache/artsy_times.pkl').expanduser()
+
+
+def _load_sidecars(path):
+    """Memory-map the cached grid, mask, and image for path and load the
+    axes and full-grid histogram counts, or return None if any sidecar
+    is missing, stale, or in an old format.
+    """
+    grid_path = Path(str(path) + '.grid.npy')
+    mask_path = Path(str(path) + '.mask.npy')
+    rgba_path = Path(str(path) + '.rgba.npy')
+    hist_path = Path(str(path) + '.hist.npz')
+    try:
+        src_mtime = os.path.getmtime(str(path))
+        for pp in (grid_path, mask_path, rgba_path, hist_path):
+            if pp.stat().st_mtime < src_mtime:
+                return None
+        # mmap serves viewport slices from the page cache instead of
+        # reading (and converting) the whole grid up front
+        regrid = np.load(str(grid_path), mmap_mode='r')
+        mask = np.load(str(mask_path), mmap_mode='r')
+        rgba = np.load(str(rgba_path), mmap_mode='r')
+        hist_load = np.load(str(hist_path))
+        if rgba.ndim != 2 or 'xn' not in hist_load.files:
+            # sidecars from before the uint32 image or cached-axes
+            # formats are rebuilt rather than served
+            return None
+        return (regrid, mask, hist_load['xn'], hist_load['yn'], rgba,
+                hist_load['counts'])
+    except OSError:
+        return None
+
+
+def _write_sidecars(path, regrid, mask, xn, yn, rgba, counts):
+    base = str(path)
+    try:
+        np.save(base + '.grid.npy', regrid)
+        np.save(base + '.mask.npy', mask)
+        np.save(base + '.rgba.npy', rgba)
+        np.savez(base + '.hist.npz', counts=counts, xn=xn, yn=yn)
+    except OSError:
+        logging.warning('Could not write sidecar cache for %s', path)
 
 
 def load_data(date='latest'):
     strformat = '%Y/%m/%d/%HZ.npz'
     dir = os.path.expanduser(DATA_DIRECTORY)
     if date == 'latest':
-        p = Path(dir)
-        path = sorted([pp for pp in p.rglob('*.npz')], reverse=True)[0]
+        # *Z.npz skips the .hist.npz sidecars; max of the date-shaped
+        # paths is the newest file without materializing and sorting
+        # the whole listing
+        path = max(Path(dir).rglob('*Z.npz'))
     else:
         path = os.path.join(dir, date.strftime(strformat))
 
     valid_date = dt.datetime.strptime(str(path), '{}/{}'.format(dir, strformat))
-    data_load = np.load(path)
-    regridded_data = data_load['data'] / 25.4  # mm to in
-    X = data_load['X']
-    Y = data_load['Y']
-    masked_regrid = np.ma.masked_less(regridded_data, MIN_VAL)
-    return masked_regrid, X, Y, valid_date
+    cached = _load_sidecars(path)
+    if cached is not None:
+        regrid, mask, xn, yn, rgba, full_counts = cached
+    else:
+        data_load = np.load(path)
+        # float32 is plenty for ~3 significant digits of precipitation
+        # and halves the memory traffic of everything downstream
+        regrid = data_load['data'].astype(np.float32) * (1 / 25.4)  # mm to in
+        xn = data_load['X'][0].astype(np.float32)
+        yn = data_load['Y'][:, 0].astype(np.float32)
+        # a plain array plus boolean mask instead of a MaskedArray keeps
+        # the per-callback work in straight NumPy; NaN from regridding
+        # outside the data hull is masked along with the below-minimum
+        # fill
+        with np.errstate(invalid='ignore'):
+            mask = ~(regrid >= MIN_VAL)
+            grey_mask = mask | (regrid < GREY_THRESHOLD)
+        rgba = _to_rgba(regrid, grey_mask)
+        full_counts = _histogram_counts(regrid[~mask])
+        _write_sidecars(path, regrid, mask, xn, yn, rgba, full_counts)
+    return regrid, mask, xn, yn, valid_date, rgba, full_counts
+
+
+def _nearest(axis, value):
+    """Find the index of the value in a monotonic 1-D axis closest to value.
+
+    Uses a binary search instead of np.abs(axis - value).argmin() so no
+    axis-sized temporary is allocated on every callback.
+    """
+    if axis[0] > axis[-1]:
+        return len(axis) - 1 - _nearest(axis[::-1], value)
+    idx = np.searchsorted(axis, value)
+    if idx <= 0:
+        return 0
+    elif idx >= len(axis):
+        return len(axis) - 1
+    if value - axis[idx - 1] <= axis[idx] - value:
+        return idx - 1
+    return idx
 
 
 def find_all_times():
     p = Path(DATA_DIRECTORY).expanduser()
+    paths = sorted(p.rglob('*Z.npz'))
+    # the parsed times only change when the set of files does, so reuse
+    # the result from a previous session when the listing matches
+    key = tuple(str(pp) for pp in paths)
+    try:
+        with open(str(TIMES_CACHE), 'rb') as f:
+            cached_key, cached_out = pickle.load(f)
+        if cached_key == key:
+            return cached_out
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
     out = OrderedDict()
-    for pp in sorted(p.rglob('*.npz')):
+    for pp in paths:
+        # YYYY/MM/DD/HHZ.npz joined; integer slicing is much faster
+        # than strptime
+        s = ''.join(pp.parts[-4:])
         try:
-            datetime = dt.datetime.strptime(''.join(pp.parts[-4:]),
-                                            '%Y%m%d%HZ.npz')
+            if s[10:] != 'Z.npz':
+                raise ValueError(s)
+            datetime = dt.datetime(int(s[0:4]), int(s[4:6]), int(s[6:8]),
+                                   int(s[8:10]))
         except ValueError:
             logging.debug('%s does not conform to expected format', pp)
             continue
         date = datetime.strftime('%Y-%m-%d %HZ')
         out[date] = datetime
+    try:
+        TIMES_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with open(str(TIMES_CACHE), 'wb') as f:
+            pickle.dump((key, out), f)
+    except OSError:
+        logging.warning('Could not write times cache to %s', TIMES_CACHE)
     return out
 
 
 # setup the coloring
 levels = MaxNLocator(nbins=10*MAX_VAL + 1).tick_values(0, MAX_VAL)
+# the levels are uniform, so histogram bin indices can be computed with a
+# single multiply-and-cast instead of np.histogram's searchsorted pass
+nbins = len(levels) - 1
+inv_dx = nbins / MAX_VAL
+# clipping just below MAX_VAL keeps the right edge in the last bin for
+# both histogram paths without a fold-in step; computed in float32 so it
+# still rounds below MAX_VAL for the float32 grid
+clip_max = np.nextafter(np.float32(MAX_VAL), np.float32(0))
+# centers of the uniform bins, for estimating a subset mean from its
+# histogram without another pass over the data
+bin_mids = (np.arange(nbins) + 0.5) * (MAX_VAL / nbins)
 cmap = get_cmap('viridis')
 cmap.set_bad(color='k')
 cmap.set_under(color='k')
@@ -79,6 +205,123 @@ ticker = FixedTicker(ticks=l)
 cb = ColorBar(color_mapper=color_mapper, location=(0, 0),
               scale_alpha=ALPHA, ticker=ticker)
 
+# 256 colormap entries plus sentinel rows for over (256) and bad/under
+# (257), so coloring the grid is a single table lookup per pixel
+rgba_lut = np.empty((258, 4), dtype=np.uint8)
+rgba_lut[:256] = cmap(np.linspace(0, 1, 256), bytes=True)
+rgba_lut[256] = cmap(np.array([2.0]), bytes=True)[0]
+rgba_lut[257] = cmap(np.ma.masked_all((1,)), bytes=True)[0]
+rgba_lut[:, 3] = int(ALPHA * 255)
+
+
+def _to_rgba(data, mask):
+    """Color a grid as uint8 RGBA with the precomputed lookup table.
+
+    Produces the same image as sm.to_rgba on the equivalent MaskedArray
+    with bytes=True and alpha=ALPHA, but with one gather per pixel
+    instead of a Normalize pass plus the colormap machinery.
+    """
+    scaled = data * (256 / MAX_VAL)
+    over = scaled > 256
+    bad = ~(scaled >= 0) | mask
+    np.clip(scaled, 0, 255, out=scaled)
+    scaled[over] = 256
+    scaled[bad] = 257
+    rgba = rgba_lut[scaled.astype(np.uint16)]
+    # a 2-D uint32 view is image_rgba's native format and goes over the
+    # websocket as a raw binary buffer rather than base64 JSON
+    return rgba.view(np.uint32).reshape(data.shape)
+
+
+def _assemble_counts(uniform_counts, below_grey):
+    # split the first uniform bin at GREY_THRESHOLD like the old
+    # np.insert(levels, 1, GREY_THRESHOLD) bin edges did
+    return np.concatenate(
+        ([below_grey, uniform_counts[0] - below_grey],
+         uniform_counts[1:nbins]))
+
+
+def _histogram_counts(arr):
+    """Count the values of a 1-D array of unmasked data into the
+    histogram bins. Clips arr in place.
+    """
+    np.clip(arr, 0, clip_max, out=arr)
+    if histogram1d is not None:
+        uniform_counts = histogram1d(arr, bins=nbins, range=(0, MAX_VAL))
+    else:
+        bin_idx = (arr * inv_dx).astype(np.intp)
+        uniform_counts = np.bincount(bin_idx, minlength=nbins)
+    below_grey = np.count_nonzero(arr < GREY_THRESHOLD)
+    return _assemble_counts(uniform_counts, below_grey)
+
+
+def _counts_mean(counts):
+    """Estimate the mean of the binned values from assembled counts."""
+    uniform = np.empty(nbins)
+    uniform[0] = counts[0] + counts[1]
+    uniform[1:] = counts[2:]
+    total = uniform.sum()
+    return float((uniform * bin_mids).sum() / total) if total else 0.0
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _hist_mean_kernel(data, mask, inv_dx, nbins, clip_max, grey,
+                          nchunks):
+        """Fused clip, mask test, binning, and sum in one parallel pass.
+
+        The rows are split into nchunks row blocks with per-chunk
+        accumulators instead of using numba.get_thread_id(), which
+        would make the compiled function uncacheable.
+        """
+        counts = np.zeros((nchunks, nbins), np.int64)
+        below_grey = np.zeros(nchunks, np.int64)
+        sums = np.zeros(nchunks, np.float64)
+        nvalid = np.zeros(nchunks, np.int64)
+        nrows = data.shape[0]
+        for c in numba.prange(nchunks):
+            start = c * nrows // nchunks
+            stop = (c + 1) * nrows // nchunks
+            for i in range(start, stop):
+                for j in range(data.shape[1]):
+                    if mask[i, j]:
+                        continue
+                    v = data[i, j]
+                    sums[c] += v
+                    nvalid[c] += 1
+                    if v < grey:
+                        below_grey[c] += 1
+                    if v < 0:
+                        v = 0
+                    elif v > clip_max:
+                        v = clip_max
+                    counts[c, int(v * inv_dx)] += 1
+        out = np.zeros(nbins, np.int64)
+        for c in range(nchunks):
+            for b in range(nbins):
+                out[b] += counts[c, b]
+        return out, below_grey.sum(), sums.sum(), nvalid.sum()
+else:
+    _hist_mean_kernel = None
+
+
+def _subset_stats(data, mask):
+    """Histogram counts and mean of the unmasked values of a 2-D subset.
+
+    With numba installed the clip, mask test, binning, and exact mean
+    fuse into a single threaded pass over the subset; otherwise the
+    unmasked values are gathered once, binned, and the mean estimated
+    from the counts so no second pass is needed.
+    """
+    if _hist_mean_kernel is not None:
+        uniform_counts, below_grey, total, n = _hist_mean_kernel(
+            data, mask, inv_dx, nbins, float(clip_max),
+            float(GREY_THRESHOLD), numba.get_num_threads())
+        return (_assemble_counts(uniform_counts, below_grey),
+                total / n if n else 0.0)
+    counts = _histogram_counts(data[~mask])
+    return counts, _counts_mean(counts)
+
 # make the bokeh figures without the data yet
 width = 1024
 height = int(0.73 * width)
@@ -97,9 +340,10 @@ map_fig.xaxis.axis_label = (
 map_fig.xaxis.axis_label_text_font_size = '8pt'
 map_fig.xaxis.axis_line_alpha = 0
 
-rgba_img_source = ColumnDataSource(data={'image': [], 'x': [], 'y': [],
-                                         'dw': [], 'dh': []})
-rgba_img = map_fig.image_rgba(image='image', x='x', y='y', dw='dw', dh='dh',
+# the image lives alone in its source with the geometry as scalar glyph
+# properties, so moving the extents never retransmits the pixels
+rgba_img_source = ColumnDataSource(data={'image': []})
+rgba_img = map_fig.image_rgba(image='image', x=0, y=0, dw=0, dh=0,
                               source=rgba_img_source)
 
 
@@ -138,28 +382,33 @@ bin_centers[1] = bin_centers[1] + zero_width / 4
 bin_width[1] = bin_width[1] - zero_width / 2
 cpal = color_pal.copy()
 cpal.insert(0, '#000000')
-hist_sources = [ColumnDataSource(data={'x': [bin_centers[i]],
-                                       'top': [3.0e6],
-                                       'color': [cpal[i]],
-                                       'bottom': [0],
-                                       'width': [bin_width[i]]})
-                for i in range(len(bin_centers))]
-for source in hist_sources:
-    hist_fig.vbar(x='x', top='top', width='width', bottom='bottom',
-                  color='color', fill_alpha=ALPHA, source=source)
+bin_width = bin_width[:len(bin_centers)]
+# one source and one vbar for all bars, so an update is a single change
+# event instead of one per bin; the static columns are reused on every
+# replace
+hist_static = {'x': bin_centers, 'color': cpal,
+               'bottom': [0] * len(bin_centers), 'width': bin_width}
+hist_source = ColumnDataSource(
+    data=dict(hist_static, top=[3.0e6] * len(bin_centers)))
+hist_fig.vbar(x='x', top='top', width='width', bottom='bottom',
+              color='color', fill_alpha=ALPHA, source=hist_source)
 
 # line and point on map showing tapped location value
 line_source = ColumnDataSource(data={'x': [-1, -1], 'y': [0, 1]})
 hist_fig.line(x='x', y='y', color='red', source=line_source, alpha=ALPHA)
-hover_pt = ColumnDataSource(data={'x': [0], 'y': [0], 'x_idx': [0],
-                                  'y_idx': [0]})
+# -1 is a sentinel for "no click yet" so the same-cell guard in
+# _move_click_marker cannot swallow a first click on cell (0, 0)
+hover_pt = ColumnDataSource(data={'x': [0], 'y': [0], 'x_idx': [-1],
+                                  'y_idx': [-1]})
 map_fig.x(x='x', y='y', size=10, color='red', alpha=ALPHA,
           source=hover_pt, level='overlay')
 
 widget_width = 300
-file_dict = find_all_times()
-dates = list(file_dict.keys())[::-1]
-select_day = Select(title='Valid End', value=dates[0], options=dates,
+# filled in by a background thread after startup so the first paint does
+# not wait on the directory walk; until then the newest file is served
+# through load_data('latest')
+file_dict = OrderedDict()
+select_day = Select(title='Valid End', value='latest', options=['latest'],
                     width=widget_width)
 info_data = ColumnDataSource(data={'current_val': [0], 'mean': [0]})
 info_text = """
@@ -170,17 +419,43 @@ info_text = """
 info_div = Div(width=widget_width)
 
 # Setup the updates for all the data
-local_data_source = ColumnDataSource(data={'masked_regrid': [0], 'xn': [0],
-                                           'yn': [0],
+local_data_source = ColumnDataSource(data={'regrid': [0], 'mask': [0],
+                                           'xn': [0], 'yn': [0], 'rgba': [0],
+                                           'full_counts': [0],
+                                           'extent': [(0, 0, 0, 0)],
                                            'valid_date': [dt.datetime.now()]})
 
 
+_hist_dirty = False
+_hist_last = 0.0
+
+
+def _schedule_histogram():
+    global _hist_dirty
+    _hist_dirty = True
+
+
 def update_histogram(attr, old, new):
-    # makes it so only one callback added per 100 ms
-    try:
-        doc.add_timeout_callback(_update_histogram, 100)
-    except ValueError:
-        pass
+    # any number of range events just mark the histogram dirty; the
+    # periodic tick runs at most one update per 100 ms
+    _schedule_histogram()
+
+
+_click_event = None
+_click_last = 0.0
+
+
+def _throttle_tick():
+    global _hist_dirty, _hist_last, _click_event, _click_last
+    now = time.monotonic()
+    if _hist_dirty and now - _hist_last >= 0.1:
+        _hist_dirty = False
+        _hist_last = now
+        doc.add_next_tick_callback(_update_histogram)
+    if _click_event is not None and now - _click_last >= 0.05:
+        event, _click_event = _click_event, None
+        _click_last = now
+        doc.add_next_tick_callback(partial(_move_click_marker, event))
 
 
 @gen.coroutine
@@ -190,58 +465,66 @@ def _update_histogram():
     bottom = map_fig.y_range.start
     top = map_fig.y_range.end
 
-    masked_regrid = local_data_source.data['masked_regrid'][0]
+    regrid = local_data_source.data['regrid'][0]
+    mask = local_data_source.data['mask'][0]
     xn = local_data_source.data['xn'][0]
     yn = local_data_source.data['yn'][0]
 
-    left_idx = np.abs(xn - left).argmin()
-    right_idx = np.abs(xn - right).argmin() + 1
-    bottom_idx = np.abs(yn - bottom).argmin()
-    top_idx = np.abs(yn - top).argmin() + 1
+    left_idx = _nearest(xn, left)
+    right_idx = _nearest(xn, right) + 1
+    bottom_idx = _nearest(yn, bottom)
+    top_idx = _nearest(yn, top) + 1
     logging.debug('Updating histogram...')
-    new_subset = masked_regrid[bottom_idx:top_idx, left_idx:right_idx]
-    lev = np.insert(levels, 1, GREY_THRESHOLD)
-    counts, _ = np.histogram(
-        new_subset.clip(max=MAX_VAL), bins=lev,
-        range=(levels.min(), levels.max()))
+    new_subset = regrid[bottom_idx:top_idx, left_idx:right_idx]
+    submask = mask[bottom_idx:top_idx, left_idx:right_idx]
+    if (bottom_idx == 0 and left_idx == 0 and
+            top_idx >= regrid.shape[0] and
+            right_idx >= regrid.shape[1]):
+        # full view, e.g. the initial paint or a reset; the counts were
+        # precomputed at load time, so no pass over the grid at all
+        counts = local_data_source.data['full_counts'][0]
+        mean = _counts_mean(counts)
+    else:
+        step = int(np.sqrt(new_subset.size / HIST_PIXEL_BUDGET))
+        if step > 1:
+            # sample every step-th cell and scale the counts back up so
+            # wide zooms cost a bounded amount of work
+            new_subset = new_subset[::step, ::step]
+            submask = submask[::step, ::step]
+        counts, mean = _subset_stats(new_subset, submask)
+        if step > 1:
+            counts = counts * step ** 2
     line_source.data.update({'y': [0, counts.max()]})
-    for i, source in enumerate(hist_sources):
-        source.data.update({'top': [counts[i]]})
+    hist_source.data = dict(hist_static, top=counts.tolist())
     logging.debug('Done updating histogram')
 
-    info_data.data.update({'mean': [float(new_subset.mean())]})
+    info_data.data.update({'mean': [mean]})
     doc.add_next_tick_callback(_update_div_text)
 
 
-def update_map(attr, old, new):
-    try:
-        doc.add_timeout_callback(_update_histogram, 100)
-    except ValueError:
-        pass
+_published_rgba = None
 
 
 @gen.coroutine
 def _update_map(update_range=False):
+    global _published_rgba
     logging.debug('Updating map...')
     valid_date = local_data_source.data['valid_date'][0]
     title = 'MRMS Precipitation (inches) {} through {}'.format(
         (valid_date - dt.timedelta(hours=24)).strftime(sfmt),
         valid_date.strftime(sfmt))
     map_fig.title.text = title
-    masked_regrid = local_data_source.data['masked_regrid'][0].copy()
-    masked_regrid = np.ma.masked_where(masked_regrid < GREY_THRESHOLD,
-                                       masked_regrid)
-    xn = local_data_source.data['xn'][0]
-    yn = local_data_source.data['yn'][0]
-    rgba_vals = sm.to_rgba(masked_regrid, bytes=True, alpha=ALPHA)
-    dx = xn[1] - xn[0]
-    dy = yn[1] - yn[0]
-    rgba_img_source.data.update({'image': [rgba_vals],
-                                 'x': [xn[0] - dx / 2],
-                                 'y': [yn[0] - dy / 2],
-                                 'dw': [xn[-1] - xn[0] + dx],
-                                 'dh': [yn[-1] - yn[0] + dy]})
+    rgba_vals = local_data_source.data['rgba'][0]
+    x0, y0, dw, dh = local_data_source.data['extent'][0]
+    rgba_img.glyph.update(x=x0, y=y0, dw=dw, dh=dh)
+    if rgba_vals is not _published_rgba:
+        # whole-dict assignment sends one change event instead of
+        # per-key diffs
+        rgba_img_source.data = {'image': [rgba_vals]}
+        _published_rgba = rgba_vals
     if update_range:
+        xn = local_data_source.data['xn'][0]
+        yn = local_data_source.data['yn'][0]
         map_fig.x_range.start = xn[0]
         map_fig.x_range.end = xn[-1]
         map_fig.y_range.start = yn[0]
@@ -259,24 +542,34 @@ def update_data(attr, old, new):
 @gen.coroutine
 def _update_data(update_range=False):
     logging.debug('Updating data...')
-    date = file_dict[select_day.value]
-    masked_regrid, X, Y, valid_date = load_data(date)
-    xn = X[0]
-    yn = Y[:, 0]
-    local_data_source.data.update({'masked_regrid': [masked_regrid],
-                                   'xn': [xn], 'yn': [yn],
+    date = file_dict.get(select_day.value, 'latest')
+    if date == local_data_source.data['valid_date'][0]:
+        # already loaded, e.g. when the 'latest' placeholder swaps to
+        # the concrete newest date; reloading would also retransmit
+        # the full image
+        logging.debug('%s already loaded', date)
+        return
+    regrid, mask, xn, yn, valid_date, rgba, full_counts = load_data(date)
+    # image extents as plain scalars so redraws skip the array math
+    dx = float(xn[1] - xn[0])
+    dy = float(yn[1] - yn[0])
+    extent = (float(xn[0]) - dx / 2, float(yn[0]) - dy / 2,
+              float(xn[-1] - xn[0]) + dx, float(yn[-1] - yn[0]) + dy)
+    local_data_source.data.update({'regrid': [regrid], 'mask': [mask],
+                                   'xn': [xn], 'yn': [yn], 'rgba': [rgba],
+                                   'full_counts': [full_counts],
+                                   'extent': [extent],
                                    'valid_date': [valid_date]})
     curdoc().add_next_tick_callback(partial(_update_map, update_range))
-    curdoc().add_timeout_callback(_update_histogram, 10)
+    _schedule_histogram()
     curdoc().add_next_tick_callback(_move_hist_line)
     logging.debug('Done updating data')
 
 
 def move_click_marker(event):
-    try:
-        doc.add_timeout_callback(partial(_move_click_marker, event), 50)
-    except ValueError:
-        pass
+    # only the newest click within the throttle window is processed
+    global _click_event
+    _click_event = event
 
 
 @gen.coroutine
@@ -287,24 +580,40 @@ def _move_click_marker(event):
     xn = local_data_source.data['xn'][0]
     yn = local_data_source.data['yn'][0]
 
-    x_idx = np.abs(xn - x).argmin()
-    y_idx = np.abs(yn - y).argmin()
+    x_idx = _nearest(xn, x)
+    y_idx = _nearest(yn, y)
+    if (x_idx == hover_pt.data['x_idx'][0] and
+            y_idx == hover_pt.data['y_idx'][0]):
+        # same cell as last time; nothing would change
+        return
 
-    hover_pt.data.update({'x': [xn[x_idx]], 'y': [yn[y_idx]],
-                          'x_idx': [x_idx], 'y_idx': [y_idx]})
-    curdoc().add_next_tick_callback(_move_hist_line)
+    # batch the marker, readout, and line writes into one patch event
+    doc.hold('collect')
+    try:
+        hover_pt.data.update({'x': [xn[x_idx]], 'y': [yn[y_idx]],
+                              'x_idx': [x_idx], 'y_idx': [y_idx]})
+        _move_hist_line()
+    finally:
+        doc.unhold()
 
 
 @gen.coroutine
 def _move_hist_line():
     x_idx = hover_pt.data['x_idx'][0]
     y_idx = hover_pt.data['y_idx'][0]
-    masked_regrid = local_data_source.data['masked_regrid'][0]
-    val = masked_regrid[y_idx, x_idx]
-    info_data.data.update({'current_val': [float(val)]})
+    if x_idx < 0:
+        # nothing clicked yet
+        return
+    regrid = local_data_source.data['regrid'][0]
+    mask = local_data_source.data['mask'][0]
+    if mask[y_idx, x_idx]:
+        val = MIN_VAL
+    else:
+        val = float(regrid[y_idx, x_idx])
+    info_data.data.update({'current_val': [val]})
     doc.add_next_tick_callback(_update_div_text)
 
-    if val <= MIN_VAL or val == np.nan:
+    if val <= MIN_VAL:
         val = MIN_VAL * 1.05
     elif val > MAX_VAL:
         val = MAX_VAL * .99
@@ -319,6 +628,21 @@ def _update_div_text():
     info_div.text = info_text.format(current_val=current_val,
                                      mean=mean)
 
+
+def _populate_times():
+    found = find_all_times()
+
+    def _apply():
+        file_dict.update(found)
+        dates = list(found.keys())[::-1]
+        select_day.options = dates
+        if dates and select_day.value not in file_dict:
+            # replaces the 'latest' placeholder; the resulting reload
+            # of the same file is served from the sidecar cache
+            select_day.value = dates[0]
+
+    doc.add_next_tick_callback(_apply)
+
 # python callbacks
 map_fig.x_range.on_change('start', update_histogram)
 map_fig.x_range.on_change('end', update_histogram)
@@ -338,4 +662,6 @@ doc = curdoc()
 doc.title = 'UA HAS ARTSy'
 doc.template_variables.update(max_val=MAX_VAL, min_val=GREY_THRESHOLD)
 doc.add_root(lay)
+doc.add_periodic_callback(_throttle_tick, 100)
+threading.Thread(target=_populate_times, daemon=True).start()
 doc.add_next_tick_callback(partial(_update_data, True))
@@ -89,7 +89,9 @@ def save_data(base_dir, valid_date, regridded_data, X, Y, overwrite):
     if os.path.isfile(path) and not overwrite:
         logging.error('%s already exists', path)
         sys.exit(1)
-    np.savez_compressed(path, data=regridded_data, X=X, Y=Y)
+    # uncompressed so the plotting app can read straight from the OS
+    # page cache instead of decompressing the whole archive
+    np.savez(path, data=regridded_data, X=X, Y=Y)
 
 
 def main():